@@ -7,7 +7,11 @@ from crewai import Agent
 from crewai import LLM
 from tools import search_tool, BloodTestReportTool
 
+# Verbose agent/crew logging is costly per step; opt in with CREW_VERBOSE=1
+VERBOSE = os.getenv("CREW_VERBOSE", "0") == "1"
+
 ### Loading LLM - Use CrewAI's LLM wrapper for Gemini
+# litellm caches a pooled HTTP client per provider, so agent calls already reuse connections
 llm = LLM(
     model="gemini/gemini-1.5-flash",
     api_key=os.getenv("GEMINI_API_KEY")
@@ -17,7 +21,7 @@ llm = LLM(
 doctor = Agent(
     role="Senior Medical Doctor and Blood Test Specialist",
     goal="Provide accurate, evidence-based analysis of blood test reports and medical recommendations for: {query}",
-    verbose=True,
+    verbose=VERBOSE,
     memory=True,
     backstory=(
         "You are a highly qualified medical doctor with 15+ years of experience in laboratory medicine and internal medicine. "
@@ -29,16 +33,16 @@ doctor = Agent(
     ),
     tools=[BloodTestReportTool()],
     llm=llm,
-    max_iter=3,
+    max_iter=2,
     max_rpm=10,
-    allow_delegation=True
+    allow_delegation=False
 )
 
 # Creating a verifier agent
 verifier = Agent(
     role="Medical Document Verifier",
     goal="Verify that uploaded documents are valid blood test reports and contain analyzable medical data",
-    verbose=True,
+    verbose=VERBOSE,
     memory=True,
     backstory=(
         "You are a medical records specialist with expertise in identifying and validating medical documents. "
@@ -48,7 +52,7 @@ verifier = Agent(
     ),
     tools=[BloodTestReportTool()],
     llm=llm,
-    max_iter=2,
+    max_iter=1,
     max_rpm=10,
     allow_delegation=False
 )
@@ -57,7 +61,7 @@ verifier = Agent(
 nutritionist = Agent(
     role="Clinical Nutritionist",
     goal="Provide evidence-based nutritional recommendations based on blood test results and health markers",
-    verbose=True,
+    verbose=VERBOSE,
     memory=True,
     backstory=(
         "You are a registered dietitian and clinical nutritionist with expertise in medical nutrition therapy. "
@@ -76,7 +80,7 @@ nutritionist = Agent(
 exercise_specialist = Agent(
     role="Clinical Exercise Physiologist",
     goal="Develop safe, personalized exercise recommendations based on health status and blood test results",
-    verbose=True,
+    verbose=VERBOSE,
     memory=True,
     backstory=(
         "You are a certified clinical exercise physiologist with expertise in exercise prescription for various health conditions. "
@@ -1,13 +1,66 @@
 import sqlite3
+import asyncio
+import time
 import aiosqlite
-from datetime import datetime
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 import json
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Pragmas applied to every connection we open
+SQLITE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA mmap_size=268435456",
+)
+
+# Rows aiosqlite pulls per worker-thread hop when iterating a cursor
+ITER_CHUNK_SIZE = 256
+
+# Per-connection prepared statement cache (sqlite3 default is 128)
+CACHED_STATEMENTS = 256
+
+# Hot-path statements, kept as constants so every call hits the statement cache
+_SQL_INSERT = '''
+    INSERT INTO analyses (id, filename, query, analysis_type, status, result, created_at, updated_at, file_hash, owner)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_IF_ABSENT = '''
+    INSERT OR IGNORE INTO analyses (id, filename, query, analysis_type, status, result, created_at, updated_at, file_hash, owner)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_GET = '''
+    SELECT id, filename, query, analysis_type, status, result, created_at, updated_at
+    FROM analyses WHERE id = ?
+'''
+
+_SQL_UPD_STATUS = '''
+    UPDATE analyses SET status = ?, updated_at = ?
+    WHERE id = ?
+'''
+
+_SQL_UPD_RESULT = '''
+    UPDATE analyses SET status = ?, result = ?, updated_at = ?
+    WHERE id = ?
+'''
+
+_EPOCH = datetime(1970, 1, 1)
+
+def now_ms() -> int:
+    """Current UTC time as unix epoch milliseconds"""
+    return time.time_ns() // 1_000_000
+
+def ms_to_datetime(ms: int) -> datetime:
+    """Convert unix epoch milliseconds to a naive UTC datetime"""
+    return _EPOCH + timedelta(milliseconds=ms)
+
 @dataclass
 class AnalysisResult:
     """Data class for analysis results"""
@@ -17,95 +70,247 @@ class AnalysisResult:
     analysis_type: str
     status: str  # queued, processing, completed, failed
     result: Optional[str]
-    created_at: datetime
-    updated_at: datetime
+    created_at: int  # unix epoch milliseconds
+    updated_at: int  # unix epoch milliseconds
+    file_hash: Optional[str] = None  # sha256 of the uploaded PDF
+    owner: Optional[str] = None  # process whose in-memory queue holds the job, if any
+
+def _analysis_row(analysis: AnalysisResult) -> tuple:
+    """Parameters for _SQL_INSERT"""
+    return (
+        analysis.id,
+        analysis.filename,
+        analysis.query,
+        analysis.analysis_type,
+        analysis.status,
+        analysis.result,
+        analysis.created_at,
+        analysis.updated_at,
+        analysis.file_hash,
+        analysis.owner
+    )
 
 class DatabaseManager:
     """Database manager for storing analysis results and user data"""
     
-    def __init__(self, db_path: str = "blood_analysis.db"):
+    def __init__(self, db_path: str = "blood_analysis.db", read_pool_size: int = 4):
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        self._db: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._write_lock = asyncio.Lock()
+    
+    async def _connect(self, database: str, **kwargs) -> aiosqlite.Connection:
+        """Open a connection and apply the shared pragmas"""
+        db = await aiosqlite.connect(
+            database,
+            iter_chunk_size=ITER_CHUNK_SIZE,
+            cached_statements=CACHED_STATEMENTS,
+            **kwargs
+        )
+        for pragma in SQLITE_PRAGMAS:
+            await db.execute(pragma)
+        return db
+    
+    @asynccontextmanager
+    async def _reader(self):
+        """Borrow a read-only connection from the pool"""
+        db = await self._readers.get()
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+    
+    @asynccontextmanager
+    async def _writer(self):
+        """Hold the shared writer, rolling back whatever a failed block left open
+        
+        sqlite3 begins a transaction implicitly before a write, and a failing
+        statement leaves it open, holding the WAL write lock until some later
+        unrelated commit.
+        """
+        async with self._write_lock:
+            db = self._db
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
     
     async def init_db(self):
-        """Initialize database tables"""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Create analyses table
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS analyses (
-                    id TEXT PRIMARY KEY,
-                    filename TEXT NOT NULL,
-                    query TEXT NOT NULL,
-                    analysis_type TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    result TEXT,
-                    created_at TIMESTAMP NOT NULL,
-                    updated_at TIMESTAMP NOT NULL
-                )
-            ''')
-            
-            # Create users table for future expansion
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id TEXT PRIMARY KEY,
-                    email TEXT UNIQUE,
-                    name TEXT,
-                    created_at TIMESTAMP NOT NULL,
-                    updated_at TIMESTAMP NOT NULL
-                )
-            ''')
-            
-            # Create analysis_metadata table for additional info
-            await db.execute('''
-                CREATE TABLE IF NOT EXISTS analysis_metadata (
-                    analysis_id TEXT PRIMARY KEY,
-                    file_size INTEGER,
-                    processing_time_seconds REAL,
-                    model_version TEXT,
-                    additional_data TEXT,
-                    FOREIGN KEY (analysis_id) REFERENCES analyses (id)
-                )
-            ''')
-            
-            # Create indexes for better performance
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_status ON analyses(status)')
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses(created_at)')
-            await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_type ON analyses(analysis_type)')
-            
-            await db.commit()
-            logger.info("Database initialized successfully")
+        """Open the shared connections and initialize database tables"""
+        db = self._db = await self._connect(self.db_path)
+        
+        # WAL is persisted in the database file, so only the writer sets it
+        await db.execute('PRAGMA journal_mode=WAL')
+        
+        # Create analyses table
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS analyses (
+                id TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                query TEXT NOT NULL,
+                analysis_type TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                created_at INTEGER NOT NULL,
+                updated_at INTEGER NOT NULL,
+                file_hash TEXT,
+                owner TEXT
+            )
+        ''')
+        
+        # Databases created before file_hash or owner existed need the columns added
+        cursor = await db.execute('PRAGMA table_info(analyses)')
+        columns = [column[1] for column in await cursor.fetchall()]
+        for column in ('file_hash', 'owner'):
+            if column not in columns:
+                await db.execute(f'ALTER TABLE analyses ADD COLUMN {column} TEXT')
+        
+        # Older rows stored ISO timestamp text; convert them to epoch milliseconds
+        await db.execute('''
+            UPDATE analyses SET
+                created_at = CAST(ROUND((julianday(created_at) - 2440587.5) * 86400000) AS INTEGER),
+                updated_at = CAST(ROUND((julianday(updated_at) - 2440587.5) * 86400000) AS INTEGER)
+            WHERE typeof(created_at) = 'text' OR typeof(updated_at) = 'text'
+        ''')
+        
+        # Create users table for future expansion
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS users (
+                id TEXT PRIMARY KEY,
+                email TEXT UNIQUE,
+                name TEXT,
+                created_at TIMESTAMP NOT NULL,
+                updated_at TIMESTAMP NOT NULL
+            )
+        ''')
+        
+        # Create analysis_metadata table for additional info
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_metadata (
+                analysis_id TEXT PRIMARY KEY,
+                file_size INTEGER,
+                processing_time_seconds REAL,
+                model_version TEXT,
+                additional_data TEXT,
+                FOREIGN KEY (analysis_id) REFERENCES analyses (id)
+            )
+        ''')
+        
+        # Liveness of processes whose in-memory queue owns analyses
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS queue_owners (
+                owner TEXT PRIMARY KEY,
+                heartbeat_at INTEGER NOT NULL
+            )
+        ''')
+        
+        # Create response_cache table for reusing crew results
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS response_cache (
+                key TEXT PRIMARY KEY,
+                file_hash TEXT NOT NULL,
+                analysis_type TEXT NOT NULL,
+                embedding BLOB,
+                result TEXT NOT NULL,
+                created_at INTEGER NOT NULL
+            )
+        ''')
+        
+        # Create indexes for better performance
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_status ON analyses(status)')
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_created_at ON analyses(created_at)')
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_type ON analyses(analysis_type)')
+        # Covering index for list_analyses, so listing never touches the result text
+        await db.execute('''
+            CREATE INDEX IF NOT EXISTS idx_analyses_list
+            ON analyses(created_at DESC, id DESC, filename, query, analysis_type, status, updated_at)
+        ''')
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_analyses_dedupe ON analyses(file_hash, query, analysis_type, status)')
+        await db.execute('CREATE INDEX IF NOT EXISTS idx_response_cache_file ON response_cache(file_hash, analysis_type)')
+        
+        await db.commit()
+        
+        # Read-only pool; under WAL these never block on the writer
+        self._readers = asyncio.Queue()
+        for _ in range(self.read_pool_size):
+            reader = await self._connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._readers.put_nowait(reader)
+        
+        logger.info("Database initialized successfully")
+    
+    async def close(self):
+        """Close the shared writer and pooled readers"""
+        if self._readers is not None:
+            while not self._readers.empty():
+                await self._readers.get_nowait().close()
+            self._readers = None
+        
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
     
     async def create_analysis(self, analysis: AnalysisResult) -> bool:
         """Create a new analysis record"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    INSERT INTO analyses (id, filename, query, analysis_type, status, result, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    analysis.id,
-                    analysis.filename,
-                    analysis.query,
-                    analysis.analysis_type,
-                    analysis.status,
-                    analysis.result,
-                    analysis.created_at,
-                    analysis.updated_at
-                ))
+            async with self._writer() as db:
+                await db.execute(_SQL_INSERT, _analysis_row(analysis))
                 await db.commit()
-                logger.info(f"Analysis {analysis.id} created successfully")
+                logger.debug(f"Analysis {analysis.id} created successfully")
                 return True
         except Exception as e:
             logger.error(f"Error creating analysis: {str(e)}")
             return False
     
+    async def create_analysis_if_absent(self, analysis: AnalysisResult) -> Optional[Tuple[bool, str]]:
+        """Insert an analysis unless a row with its id already exists
+        
+        Returns (created, status). A failed row with the same id is reset to
+        the new analysis and counts as created; any other existing row is left
+        alone and its status returned. None on error.
+        """
+        try:
+            async with self._writer() as db:
+                cursor = await db.execute(_SQL_INSERT_IF_ABSENT, _analysis_row(analysis))
+                if cursor.rowcount == 0:
+                    cursor = await db.execute('''
+                        UPDATE analyses SET filename = ?, status = ?, result = ?, updated_at = ?, file_hash = ?, owner = ?
+                        WHERE id = ? AND status = 'failed'
+                    ''', (analysis.filename, analysis.status, analysis.result,
+                          analysis.updated_at, analysis.file_hash, analysis.owner, analysis.id))
+                    if cursor.rowcount == 0:
+                        cursor = await db.execute('SELECT status FROM analyses WHERE id = ?', (analysis.id,))
+                        row = await cursor.fetchone()
+                        await db.commit()
+                        return (False, row[0]) if row else None
+                await db.commit()
+                logger.debug(f"Analysis {analysis.id} created successfully")
+                return (True, analysis.status)
+        except Exception as e:
+            logger.error(f"Error creating analysis: {str(e)}")
+            return None
+    
+    async def create_analyses_bulk(self, analyses: List[AnalysisResult]) -> bool:
+        """Create many analysis records in a single transaction"""
+        if not analyses:
+            return True
+        
+        try:
+            async with self._writer() as db:
+                await db.executemany(_SQL_INSERT, [_analysis_row(a) for a in analyses])
+                await db.commit()
+                logger.debug(f"{len(analyses)} analyses created successfully")
+                return True
+        except Exception as e:
+            logger.error(f"Error creating analyses in bulk: {str(e)}")
+            return False
+    
     async def get_analysis(self, analysis_id: str) -> Optional[AnalysisResult]:
         """Get analysis by ID"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute('''
-                    SELECT id, filename, query, analysis_type, status, result, created_at, updated_at
-                    FROM analyses WHERE id = ?
-                ''', (analysis_id,))
+            async with self._reader() as db:
+                cursor = await db.execute(_SQL_GET, (analysis_id,))
                 
                 row = await cursor.fetchone()
                 if row:
@@ -116,24 +321,76 @@ class DatabaseManager:
                         analysis_type=row[3],
                         status=row[4],
                         result=row[5],
-                        created_at=datetime.fromisoformat(row[6]),
-                        updated_at=datetime.fromisoformat(row[7])
+                        created_at=row[6],
+                        updated_at=row[7]
                     )
                 return None
         except Exception as e:
             logger.error(f"Error getting analysis: {str(e)}")
             return None
     
+    async def find_matching_analysis(self, file_hash: str, query: str, analysis_type: str) -> Optional[Tuple[str, str]]:
+        """Find the latest queued, processing or completed analysis for an identical request"""
+        try:
+            async with self._reader() as db:
+                cursor = await db.execute('''
+                    SELECT id, status FROM analyses
+                    WHERE file_hash = ? AND query = ? AND analysis_type = ?
+                    AND status IN ('queued', 'processing', 'completed')
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                ''', (file_hash, query, analysis_type))
+                row = await cursor.fetchone()
+                return (row[0], row[1]) if row else None
+        except Exception as e:
+            logger.error(f"Error finding matching analysis: {str(e)}")
+            return None
+    
+    async def heartbeat_queue_owner(self, owner: str) -> bool:
+        """Record that the process behind an in-memory queue is still alive"""
+        try:
+            async with self._writer() as db:
+                await db.execute(
+                    'INSERT OR REPLACE INTO queue_owners (owner, heartbeat_at) VALUES (?, ?)',
+                    (owner, now_ms())
+                )
+                await db.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error recording queue heartbeat: {str(e)}")
+            return False
+    
+    async def fail_orphaned_analyses(self, alive_since_ms: int, reason: str) -> int:
+        """Fail queued or processing analyses whose owning queue has stopped heartbeating
+        
+        An in-memory queue dies with its process, so its in-flight rows would
+        otherwise stay in flight forever and block identical resubmissions.
+        Rows without an owner predate ownership and are failed too.
+        """
+        try:
+            async with self._writer() as db:
+                cursor = await db.execute('''
+                    UPDATE analyses SET status = 'failed', result = ?, updated_at = ?
+                    WHERE status IN ('queued', 'processing')
+                    AND (owner IS NULL OR owner NOT IN (
+                        SELECT owner FROM queue_owners WHERE heartbeat_at >= ?
+                    ))
+                ''', (reason, now_ms(), alive_since_ms))
+                failed = cursor.rowcount
+                await db.execute('DELETE FROM queue_owners WHERE heartbeat_at < ?', (alive_since_ms,))
+                await db.commit()
+                return failed
+        except Exception as e:
+            logger.error(f"Error failing orphaned analyses: {str(e)}")
+            return 0
+    
     async def update_analysis_status(self, analysis_id: str, status: str) -> bool:
         """Update analysis status"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    UPDATE analyses SET status = ?, updated_at = ?
-                    WHERE id = ?
-                ''', (status, datetime.utcnow(), analysis_id))
+            async with self._writer() as db:
+                await db.execute(_SQL_UPD_STATUS, (status, now_ms(), analysis_id))
                 await db.commit()
-                logger.info(f"Analysis {analysis_id} status updated to {status}")
+                logger.debug(f"Analysis {analysis_id} status updated to {status}")
                 return True
         except Exception as e:
             logger.error(f"Error updating analysis status: {str(e)}")
@@ -142,28 +399,35 @@ class DatabaseManager:
     async def update_analysis_result(self, analysis_id: str, status: str, result: str) -> bool:
         """Update analysis result and status"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    UPDATE analyses SET status = ?, result = ?, updated_at = ?
-                    WHERE id = ?
-                ''', (status, result, datetime.utcnow(), analysis_id))
+            async with self._writer() as db:
+                await db.execute(_SQL_UPD_RESULT, (status, result, now_ms(), analysis_id))
                 await db.commit()
-                logger.info(f"Analysis {analysis_id} completed with status {status}")
+                logger.debug(f"Analysis {analysis_id} completed with status {status}")
                 return True
         except Exception as e:
             logger.error(f"Error updating analysis result: {str(e)}")
             return False
     
-    async def list_analyses(self, limit: int = 10, offset: int = 0) -> List[AnalysisResult]:
-        """List analyses with pagination"""
+    async def list_analyses(self, limit: int = 10, offset: int = 0,
+                            after: Optional[Tuple[int, str]] = None) -> List[AnalysisResult]:
+        """List analysis metadata newest first; ``after`` is a (created_at, id) keyset cursor"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute('''
-                    SELECT id, filename, query, analysis_type, status, result, created_at, updated_at
-                    FROM analyses 
-                    ORDER BY created_at DESC 
-                    LIMIT ? OFFSET ?
-                ''', (limit, offset))
+            async with self._reader() as db:
+                if after is not None:
+                    cursor = await db.execute('''
+                        SELECT id, filename, query, analysis_type, status, created_at, updated_at
+                        FROM analyses
+                        WHERE (created_at, id) < (?, ?)
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT ?
+                    ''', (after[0], after[1], limit))
+                else:
+                    cursor = await db.execute('''
+                        SELECT id, filename, query, analysis_type, status, created_at, updated_at
+                        FROM analyses
+                        ORDER BY created_at DESC, id DESC
+                        LIMIT ? OFFSET ?
+                    ''', (limit, offset))
                 
                 rows = await cursor.fetchall()
                 return [
@@ -173,9 +437,9 @@ class DatabaseManager:
                         query=row[2],
                         analysis_type=row[3],
                         status=row[4],
-                        result=row[5],
-                        created_at=datetime.fromisoformat(row[6]),
-                        updated_at=datetime.fromisoformat(row[7])
+                        result=None,
+                        created_at=row[5],
+                        updated_at=row[6]
                     )
                     for row in rows
                 ]
@@ -186,7 +450,7 @@ class DatabaseManager:
     async def delete_analysis(self, analysis_id: str) -> bool:
         """Delete analysis record"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with self._writer() as db:
                 cursor = await db.execute('DELETE FROM analyses WHERE id = ?', (analysis_id,))
                 await db.commit()
                 return cursor.rowcount > 0
@@ -197,22 +461,26 @@ class DatabaseManager:
     async def get_analysis_stats(self) -> dict:
         """Get analysis statistics"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                # Total analyses
-                cursor = await db.execute('SELECT COUNT(*) FROM analyses')
-                total = (await cursor.fetchone())[0]
-                
-                # Status breakdown
+            async with self._reader() as db:
+                # Total, status and type breakdowns in one round-trip
                 cursor = await db.execute('''
-                    SELECT status, COUNT(*) FROM analyses GROUP BY status
+                    SELECT 'total', '', COUNT(*) FROM analyses
+                    UNION ALL
+                    SELECT 'status', status, COUNT(*) FROM analyses GROUP BY status
+                    UNION ALL
+                    SELECT 'type', analysis_type, COUNT(*) FROM analyses GROUP BY analysis_type
                 ''')
-                status_counts = dict(await cursor.fetchall())
                 
-                # Analysis type breakdown
-                cursor = await db.execute('''
-                    SELECT analysis_type, COUNT(*) FROM analyses GROUP BY analysis_type
-                ''')
-                type_counts = dict(await cursor.fetchall())
+                total = 0
+                status_counts = {}
+                type_counts = {}
+                for kind, value, count in await cursor.fetchall():
+                    if kind == 'total':
+                        total = count
+                    elif kind == 'status':
+                        status_counts[value] = count
+                    else:
+                        type_counts[value] = count
                 
                 return {
                     'total_analyses': total,
@@ -223,12 +491,54 @@ class DatabaseManager:
             logger.error(f"Error getting stats: {str(e)}")
             return {}
     
+    async def get_cached_result(self, key: str) -> Optional[str]:
+        """Get a cached crew result by exact key"""
+        try:
+            async with self._reader() as db:
+                cursor = await db.execute('SELECT result FROM response_cache WHERE key = ?', (key,))
+                row = await cursor.fetchone()
+                return row[0] if row else None
+        except Exception as e:
+            logger.error(f"Error reading response cache: {str(e)}")
+            return None
+    
+    async def list_cached_embeddings(self, file_hash: str, analysis_type: str) -> List[Tuple[bytes, str]]:
+        """List (embedding, result) pairs cached for a file and analysis type"""
+        try:
+            async with self._reader() as db:
+                cursor = await db.execute('''
+                    SELECT embedding, result FROM response_cache
+                    WHERE file_hash = ? AND analysis_type = ? AND embedding IS NOT NULL
+                ''', (file_hash, analysis_type))
+                return await cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Error reading response cache: {str(e)}")
+            return []
+    
+    async def store_cached_result(self, key: str, file_hash: str, analysis_type: str,
+                                  embedding: Optional[bytes], result: str) -> bool:
+        """Store a crew result in the response cache"""
+        try:
+            async with self._writer() as db:
+                await db.execute('''
+                    INSERT OR REPLACE INTO response_cache (key, file_hash, analysis_type, embedding, result, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (key, file_hash, analysis_type, embedding, result, now_ms()))
+                await db.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error writing response cache: {str(e)}")
+            return False
+    
     async def health_check(self) -> dict:
         """Database health check"""
+        if self._db is None:
+            return {"status": "unhealthy", "error": "database not initialized"}
+        
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                cursor = await db.execute('SELECT 1')
-                await cursor.fetchone()
-                return {"status": "healthy", "connection": "ok"}
+            # Probe the shared writer handle so liveness checks never queue behind busy readers
+            cursor = await self._db.execute('SELECT 1')
+            await cursor.fetchone()
+            return {"status": "healthy", "connection": "ok"}
         except Exception as e:
             return {"status": "unhealthy", "error": str(e)}
\ No newline at end of file
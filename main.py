@@ -1,23 +1,79 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import os
 import uuid
+import hashlib
 import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from typing import Deque, Dict, List, Optional
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
+import aiofiles
+import orjson
+import aiofiles.os
 from crewai import Crew, Process
-from agents import doctor, verifier, nutritionist, exercise_specialist
+from agents import doctor, verifier, nutritionist, exercise_specialist, VERBOSE
 from tasks import help_patients, verification_task, nutrition_analysis, exercise_planning
-from database import DatabaseManager, AnalysisResult
-from queue_worker import QueueManager
+from tools import load_report_text, preload_report, discard_report
+from database import DatabaseManager, AnalysisResult, now_ms, ms_to_datetime
+from queue_worker import QueueManager, TaskStatus
+from response_cache import ResponseCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Set while root handlers are served from a listener thread
+log_listener: Optional[QueueListener] = None
+
+def start_log_listener():
+    """Route root logging through a queue so handler I/O runs off the event loop"""
+    global log_listener
+    if log_listener is not None:
+        return
+    
+    root = logging.getLogger()
+    handlers = root.handlers[:] or [logging.StreamHandler()]
+    for handler in handlers:
+        root.removeHandler(handler)
+    
+    log_queue = queue.Queue(-1)
+    root.addHandler(QueueHandler(log_queue))
+    log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    log_listener.start()
+
+def stop_log_listener():
+    """Flush queued records and hand the original handlers back to the root logger"""
+    global log_listener
+    if log_listener is None:
+        return
+    
+    log_listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    for handler in log_listener.handlers:
+        root.addHandler(handler)
+    log_listener = None
+
+class UTCORJSONResponse(Response):
+    """JSON response rendered by orjson, serializing naive datetimes as UTC
+    
+    Built on Response rather than FastAPI's deprecated ORJSONResponse; routes
+    returning it skip jsonable_encoder entirely.
+    """
+    media_type = "application/json"
+    
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NAIVE_UTC)
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Blood Test Report Analyzer",
@@ -38,49 +94,196 @@ app.add_middleware(
 
 # Initialize database and queue managers
 db_manager = DatabaseManager()
-queue_manager = QueueManager()
+queue_manager = QueueManager(
+    redis_url=os.getenv("REDIS_URL"),
+    redis_protocol=int(os.getenv("REDIS_PROTOCOL", "2"))
+)
+response_cache = ResponseCache(
+    db_manager,
+    similarity_threshold=float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.95"))
+)
+
+class RateLimiter:
+    """Sliding-window request limiter keyed by client address"""
+    
+    def __init__(self, limit: int, window_seconds: float = 60.0, max_clients: int = 10000):
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.max_clients = max_clients
+        self._hits: Dict[str, Deque[float]] = {}
+    
+    def allow(self, client: str) -> bool:
+        """Record a request and return False once the client is over its limit"""
+        if self.limit <= 0:
+            return True
+        
+        now = time.monotonic()
+        cutoff = now - self.window_seconds
+        
+        # Forget idle clients so the table stays bounded
+        if len(self._hits) >= self.max_clients:
+            self._hits = {k: v for k, v in self._hits.items() if v and v[-1] > cutoff}
+        
+        hits = self._hits.setdefault(client, deque())
+        while hits and hits[0] <= cutoff:
+            hits.popleft()
+        if len(hits) >= self.limit:
+            return False
+        hits.append(now)
+        return True
+
+# Per-client cap on /analyze submissions; 0 disables the limit
+rate_limiter = RateLimiter(int(os.getenv("ANALYZE_RATE_LIMIT_PER_MINUTE", "10")))
+
+# Uploads are streamed to disk in chunks and rejected past this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(20 * 1024 * 1024)))
+
+# Threads available for blocking crew kickoffs (each comprehensive run uses up to three)
+CREW_WORKER_THREADS = int(os.getenv("CREW_WORKER_THREADS", "16"))
+
+# Queue consumers started inside the API process; set to 0 when running worker.py instead
+QUEUE_WORKERS = int(os.getenv("QUEUE_WORKERS", "2"))
+QUEUE_IDLE_SLEEP = 0.5
+# Seconds between claim refreshes for a running task, and between stale-task sweeps
+CLAIM_REFRESH_SECONDS = 60
+QUEUE_RECOVERY_INTERVAL = float(os.getenv("QUEUE_RECOVERY_INTERVAL", "60"))
+# With the in-memory queue, analyses are owned by this process and failed by
+# sibling processes once it misses a few sweep heartbeats
+QUEUE_OWNER = uuid.uuid4().hex
+OWNER_STALE_SECONDS = 3 * QUEUE_RECOVERY_INTERVAL
+queue_worker_tasks: List[asyncio.Task] = []
+
+def install_crew_executor():
+    """Size the default executor used by asyncio.to_thread for crew kickoffs"""
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=CREW_WORKER_THREADS, thread_name_prefix="crew")
+    )
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and queue on startup"""
+    start_log_listener()
+    install_crew_executor()
+    await aiofiles.os.makedirs("data", exist_ok=True)
     await db_manager.init_db()
     logger.info("Database initialized successfully")
+    if not queue_manager.use_redis:
+        # Mark this queue alive before accepting jobs, so no sibling sweeps them
+        await db_manager.heartbeat_queue_owner(QUEUE_OWNER)
+    queue_worker_tasks.append(asyncio.create_task(queue_maintenance()))
+    
+    for worker_id in range(QUEUE_WORKERS):
+        queue_worker_tasks.append(asyncio.create_task(queue_consumer(worker_id)))
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop queue consumers and release shared database connections"""
+    for task in queue_worker_tasks:
+        task.cancel()
+    await asyncio.gather(*queue_worker_tasks, return_exceptions=True)
+    queue_worker_tasks.clear()
+    
+    await queue_manager.close()
+    await db_manager.close()
+    stop_log_listener()
+
+def derive_analysis_id(file_hasher, query: str, analysis_type: str) -> str:
+    """Derive a stable analysis id from the upload hash, query and analysis type
+    
+    Identical requests map to the same primary key, so a duplicate insert is
+    a no-op instead of a second crew run. Falls back to a random id.
+    """
+    try:
+        id_hasher = file_hasher.copy()
+        id_hasher.update(b"\0" + query.encode("utf-8") + b"\0" + analysis_type.encode("utf-8"))
+        return id_hasher.hexdigest()[:32]
+    except Exception as e:
+        logger.warning(f"Could not derive analysis id, using a random one: {str(e)}")
+        return str(uuid.uuid4())
+
+async def remove_upload(file_path: str):
+    """Delete an uploaded file without blocking the event loop"""
+    try:
+        await aiofiles.os.remove(file_path)
+    except OSError:
+        pass
+
+def upload_exists(task_data: Dict) -> bool:
+    """A recovered task can only resume while its upload is still on disk"""
+    return os.path.exists(task_data.get("file_path", ""))
+
+async def recover_queue():
+    """Requeue tasks orphaned by dead workers, failing those whose upload is gone"""
+    _, failed = await queue_manager.recover_stale_tasks(can_resume=upload_exists)
+    for analysis_id in failed:
+        await db_manager.update_analysis_result(analysis_id, "failed", "Upload no longer available, please resubmit")
+
+async def sweep_orphaned_analyses():
+    """Heartbeat this process's in-memory queue and fail analyses lost with dead ones"""
+    await db_manager.heartbeat_queue_owner(QUEUE_OWNER)
+    abandoned = await db_manager.fail_orphaned_analyses(
+        now_ms() - int(OWNER_STALE_SECONDS * 1000),
+        "Interrupted by a server restart, please resubmit"
+    )
+    if abandoned:
+        logger.warning(f"Marked {abandoned} analyses lost with a dead in-memory queue as failed")
+
+async def queue_maintenance():
+    """Recover work orphaned by dead processes at startup and then periodically, until cancelled"""
+    while True:
+        if queue_manager.use_redis:
+            await recover_queue()
+        else:
+            await sweep_orphaned_analyses()
+        await asyncio.sleep(QUEUE_RECOVERY_INTERVAL)
+
+async def keep_claim(task_id: str):
+    """Refresh a running task's queue claim until cancelled"""
+    while True:
+        await asyncio.sleep(CLAIM_REFRESH_SECONDS)
+        await queue_manager.touch_task(task_id)
+
+# Fills {medical_context} when the doctor's review already flows in as task context
+SEQUENTIAL_MEDICAL_CONTEXT = "Provided by the preceding medical analysis task."
+
+def _sequential_crew(agents, tasks) -> Crew:
+    """Build a sequential crew with the shared settings"""
+    return Crew(
+        agents=agents,
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=VERBOSE
+    )
+
+# Crew layouts per analysis type. These are templates, not shared crews:
+# kickoff() interpolates inputs into the Tasks and binds the Agents in place,
+# so concurrent runs cannot share one. Every run kicks off its own copy(),
+# which clones the Agents and Tasks, i.e. each run still builds a crew.
+CREW_TEMPLATES = {
+    "verification": _sequential_crew([verifier], [verification_task]),
+    "nutrition": _sequential_crew([doctor, nutritionist], [help_patients, nutrition_analysis]),
+    "exercise": _sequential_crew([doctor, exercise_specialist], [help_patients, exercise_planning]),
+    "comprehensive": _sequential_crew(
+        [doctor, verifier, nutritionist, exercise_specialist],
+        [verification_task, help_patients, nutrition_analysis, exercise_planning]
+    ),
+}
+
+# Stage templates of the parallel comprehensive pipeline
+DOCTOR_TEMPLATE = _sequential_crew([doctor], [help_patients])
+NUTRITION_TEMPLATE = _sequential_crew([nutritionist], [nutrition_analysis])
+EXERCISE_TEMPLATE = _sequential_crew([exercise_specialist], [exercise_planning])
 
 def run_crew(query: str, file_path: str, analysis_type: str = "comprehensive"):
     """Run the CrewAI analysis crew"""
     try:
-        if analysis_type == "verification":
-            medical_crew = Crew(
-                agents=[verifier],
-                tasks=[verification_task],
-                process=Process.sequential,
-                verbose=True
-            )
-        elif analysis_type == "nutrition":
-            medical_crew = Crew(
-                agents=[doctor, nutritionist],
-                tasks=[help_patients, nutrition_analysis],
-                process=Process.sequential,
-                verbose=True
-            )
-        elif analysis_type == "exercise":
-            medical_crew = Crew(
-                agents=[doctor, exercise_specialist],
-                tasks=[help_patients, exercise_planning],
-                process=Process.sequential,
-                verbose=True
-            )
-        else:  # comprehensive analysis
-            medical_crew = Crew(
-                agents=[doctor, verifier, nutritionist, exercise_specialist],
-                tasks=[verification_task, help_patients, nutrition_analysis, exercise_planning],
-                process=Process.sequential,
-                verbose=True
-            )
+        medical_crew = CREW_TEMPLATES.get(analysis_type, CREW_TEMPLATES["comprehensive"]).copy()
         
         result = medical_crew.kickoff({
             'query': query,
-            'file_path': file_path
+            'file_path': file_path,
+            'medical_context': SEQUENTIAL_MEDICAL_CONTEXT
         })
         
         return {
@@ -97,14 +300,75 @@ def run_crew(query: str, file_path: str, analysis_type: str = "comprehensive"):
             "analysis_type": analysis_type
         }
 
-async def process_analysis_background(analysis_id: str, query: str, file_path: str, analysis_type: str):
-    """Background task to process analysis"""
+def _kickoff_stage(template: Crew, inputs: dict) -> str:
+    """Build one crew stage from its template, run it and return its final output"""
+    return str(template.copy().kickoff(inputs))
+
+async def _medical_pipeline(inputs: dict) -> List[str]:
+    """Doctor's review, then the nutrition and exercise specialists side by side"""
+    medical_review = await asyncio.to_thread(_kickoff_stage, DOCTOR_TEMPLATE, inputs)
+    
+    # Nutrition and exercise only depend on the doctor's review
+    specialist_inputs = {**inputs, 'medical_context': medical_review}
+    nutrition_plan, exercise_plan = await asyncio.gather(
+        asyncio.to_thread(_kickoff_stage, NUTRITION_TEMPLATE, specialist_inputs),
+        asyncio.to_thread(_kickoff_stage, EXERCISE_TEMPLATE, specialist_inputs)
+    )
+    return [medical_review, nutrition_plan, exercise_plan]
+
+async def run_crew_async(query: str, file_path: str, analysis_type: str = "comprehensive"):
+    """Run the CrewAI analysis, fanning out independent specialists in parallel"""
+    if analysis_type != "comprehensive":
+        # kickoff() blocks on LLM calls, so keep it off the event loop
+        return await asyncio.to_thread(run_crew, query, file_path, analysis_type)
+    
+    try:
+        inputs = {
+            'query': query,
+            'file_path': file_path,
+            'medical_context': SEQUENTIAL_MEDICAL_CONTEXT
+        }
+        
+        # Verification runs alongside the medical pipeline and its report leads the result
+        verification_report, sections = await asyncio.gather(
+            asyncio.to_thread(_kickoff_stage, CREW_TEMPLATES["verification"], inputs),
+            _medical_pipeline(inputs)
+        )
+        
+        return {
+            "status": "success",
+            "result": "\n\n".join([verification_report, *sections]),
+            "analysis_type": analysis_type
+        }
+        
+    except Exception as e:
+        logger.error(f"Crew execution error: {str(e)}")
+        return {
+            "status": "error",
+            "error": str(e),
+            "analysis_type": analysis_type
+        }
+
+async def process_analysis_background(analysis_id: str, query: str, file_path: str, analysis_type: str, file_hash: str) -> Optional[str]:
+    """Run one attempt at an analysis and store its result if it succeeds
+    
+    Returns None on success, otherwise the error message. Failures are left
+    to the caller, which knows whether the queue will retry the task.
+    """
     try:
         # Update status to processing
         await db_manager.update_analysis_status(analysis_id, "processing")
         
+        # Parse the PDF once up front; every agent's report tool reuses this text
+        try:
+            report_text = await asyncio.to_thread(load_report_text, file_path, file_hash)
+            if report_text.strip():
+                preload_report(file_path, report_text)
+        except Exception as e:
+            logger.warning(f"Report pre-extraction failed, agents will read the PDF directly: {str(e)}")
+        
         # Run the crew analysis
-        result = run_crew(query, file_path, analysis_type)
+        result = await run_crew_async(query, file_path, analysis_type)
         
         # Update database with results
         if result["status"] == "success":
@@ -113,24 +377,54 @@ async def process_analysis_background(analysis_id: str, query: str, file_path: s
                 "completed", 
                 result["result"]
             )
-        else:
-            await db_manager.update_analysis_result(
-                analysis_id,
-                "failed",
-                result.get("error", "Unknown error")
-            )
+            await response_cache.store(file_hash, query, analysis_type, result["result"])
+            return None
+        
+        return result.get("error", "Unknown error")
             
     except Exception as e:
         logger.error(f"Background processing error: {str(e)}")
-        await db_manager.update_analysis_result(analysis_id, "failed", str(e))
+        return str(e)
     
     finally:
-        # Clean up file
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        # A retry preloads the report again
+        discard_report(file_path)
+
+async def queue_consumer(worker_id: int):
+    """Pull analysis jobs from the queue and process them until cancelled"""
+    logger.info(f"Queue consumer {worker_id} started")
+    while True:
+        # Redis dequeue waits up to a second on the asyncio client without blocking the loop
+        task = await queue_manager.get_next_task()
+        if task is None:
+            await asyncio.sleep(QUEUE_IDLE_SLEEP)
+            continue
+        
+        # A retried task can be picked up by another consumer once it is failed
+        task_id, file_path = task.id, task.data["file_path"]
+        heartbeat = asyncio.create_task(keep_claim(task_id))
+        try:
+            error = await process_analysis_background(task_id, **task.data)
+        except Exception as e:
+            error = str(e)
+        finally:
+            heartbeat.cancel()
+        
+        if error is None:
+            await queue_manager.complete_task(task_id)
+        else:
+            logger.error(f"Queue consumer {worker_id} failed task {task_id}: {error}")
+            await queue_manager.fail_task(task_id, error)
+            
+            # The in-memory queue requeues failed tasks until max_retries is spent;
+            # the row stays processing and the upload stays for the next attempt
+            status = await queue_manager.get_task_status(task_id)
+            if status is not None and status.status is TaskStatus.QUEUED:
+                continue
+            await db_manager.update_analysis_result(task_id, "failed", error)
+        
+        # The task is finished for good, so its upload is no longer needed
+        await remove_upload(file_path)
 
 @app.get("/")
 async def root():
@@ -147,7 +441,7 @@ async def health_check():
     """Detailed health check"""
     try:
         db_status = await db_manager.health_check()
-        queue_status = queue_manager.health_check()
+        queue_status = await queue_manager.health_check()
         
         return {
             "status": "healthy",
@@ -167,7 +461,7 @@ async def health_check():
 
 @app.post("/analyze")
 async def analyze_blood_report(
-    background_tasks: BackgroundTasks,
+    request: Request,
     file: UploadFile = File(...),
     query: str = Form(default="Provide comprehensive analysis of my blood test report"),
     analysis_type: str = Form(default="comprehensive")
@@ -178,19 +472,30 @@ async def analyze_blood_report(
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
     
-    # Generate unique identifiers
-    analysis_id = str(uuid.uuid4())
+    # Reject floods before doing any work
+    client = request.client.host if request.client else "unknown"
+    if not rate_limiter.allow(client):
+        raise HTTPException(status_code=429, detail="Too many analysis requests, please retry later")
+    
+    # Uploads get their own path even when the analysis id is shared
     file_id = str(uuid.uuid4())
     file_path = f"data/blood_test_report_{file_id}.pdf"
     
     try:
-        # Ensure data directory exists
-        os.makedirs("data", exist_ok=True)
-        
-        # Save uploaded file
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
+        # Stream uploaded file to disk, hashing it in the same pass
+        hasher = hashlib.sha256()
+        size = 0
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds the {MAX_UPLOAD_BYTES} byte upload limit"
+                    )
+                hasher.update(chunk)
+                await f.write(chunk)
+        file_hash = hasher.hexdigest()
         
         # Validate query
         if not query or query.strip() == "":
@@ -201,6 +506,48 @@ async def analyze_blood_report(
         if analysis_type not in valid_types:
             analysis_type = "comprehensive"
         
+        analysis_id = derive_analysis_id(hasher, query.strip(), analysis_type)
+        
+        # Identical request already completed or in flight: point at that analysis
+        existing = await db_manager.find_matching_analysis(file_hash, query.strip(), analysis_type)
+        if existing:
+            existing_id, existing_status = existing
+            await remove_upload(file_path)
+            
+            return {
+                "status": existing_status,
+                "analysis_id": existing_id,
+                "message": "Identical analysis already submitted. Use the analysis_id to check status.",
+                "query": query.strip(),
+                "analysis_type": analysis_type,
+                "file_processed": file.filename
+            }
+        
+        # Serve similar requests from the response cache without running a crew
+        cached_result = await response_cache.lookup(file_hash, query.strip(), analysis_type)
+        if cached_result is not None:
+            await remove_upload(file_path)
+            await db_manager.create_analysis_if_absent(AnalysisResult(
+                id=analysis_id,
+                filename=file.filename,
+                query=query.strip(),
+                analysis_type=analysis_type,
+                status="completed",
+                result=cached_result,
+                created_at=now_ms(),
+                updated_at=now_ms(),
+                file_hash=file_hash
+            ))
+            
+            return {
+                "status": "completed",
+                "analysis_id": analysis_id,
+                "message": "Analysis served from cache. Use the analysis_id to retrieve results.",
+                "query": query.strip(),
+                "analysis_type": analysis_type,
+                "file_processed": file.filename
+            }
+        
         # Store analysis request in database
         analysis_result = AnalysisResult(
             id=analysis_id,
@@ -209,20 +556,40 @@ async def analyze_blood_report(
             analysis_type=analysis_type,
             status="queued",
             result=None,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now_ms(),
+            updated_at=now_ms(),
+            file_hash=file_hash,
+            owner=None if queue_manager.use_redis else QUEUE_OWNER
         )
         
-        await db_manager.create_analysis(analysis_result)
+        claimed = await db_manager.create_analysis_if_absent(analysis_result)
+        if claimed is None:
+            raise HTTPException(status_code=500, detail="Could not record analysis")
         
-        # Add to background processing queue
-        background_tasks.add_task(
-            process_analysis_background,
-            analysis_id,
-            query.strip(),
-            file_path,
-            analysis_type
-        )
+        # Same id already in flight or done: a concurrent identical upload got there first
+        created, existing_status = claimed
+        if not created:
+            await remove_upload(file_path)
+            
+            return {
+                "status": existing_status,
+                "analysis_id": analysis_id,
+                "message": "Identical analysis already submitted. Use the analysis_id to check status.",
+                "query": query.strip(),
+                "analysis_type": analysis_type,
+                "file_processed": file.filename
+            }
+        
+        # Hand off to the queue consumers
+        queued = await queue_manager.enqueue_task(analysis_id, "blood_analysis", {
+            "query": query.strip(),
+            "file_path": file_path,
+            "analysis_type": analysis_type,
+            "file_hash": file_hash
+        })
+        if not queued:
+            await db_manager.update_analysis_result(analysis_id, "failed", "Could not queue analysis")
+            raise HTTPException(status_code=503, detail="Analysis queue unavailable, please retry later")
         
         return {
             "status": "queued",
@@ -235,11 +602,10 @@ async def analyze_blood_report(
         
     except Exception as e:
         # Clean up file on error
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
+        await remove_upload(file_path)
+        
+        if isinstance(e, HTTPException):
+            raise
         
         logger.error(f"Analysis error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing blood report: {str(e)}")
@@ -252,16 +618,17 @@ async def get_analysis_status(analysis_id: str):
         if not analysis:
             raise HTTPException(status_code=404, detail="Analysis not found")
         
-        return {
+        # Returned as a response object so FastAPI skips jsonable_encoder
+        return UTCORJSONResponse({
             "analysis_id": analysis_id,
             "status": analysis.status,
             "query": analysis.query,
             "analysis_type": analysis.analysis_type,
             "filename": analysis.filename,
             "result": analysis.result,
-            "created_at": analysis.created_at.isoformat(),
-            "updated_at": analysis.updated_at.isoformat()
-        }
+            "created_at": ms_to_datetime(analysis.created_at),
+            "updated_at": ms_to_datetime(analysis.updated_at)
+        })
         
     except HTTPException:
         raise
@@ -270,11 +637,27 @@ async def get_analysis_status(analysis_id: str):
         raise HTTPException(status_code=500, detail=f"Error retrieving analysis: {str(e)}")
 
 @app.get("/analysis")
-async def list_analyses(limit: int = 10, offset: int = 0):
-    """List recent analyses"""
+async def list_analyses(
+    limit: int = 10,
+    offset: int = 0,
+    after_created_at: Optional[int] = None,
+    after_id: Optional[str] = None
+):
+    """List recent analyses
+    
+    Pass the previous response's next_cursor as after_created_at/after_id to
+    page without OFFSET scans.
+    """
     try:
-        analyses = await db_manager.list_analyses(limit, offset)
-        return {
+        after = (after_created_at, after_id) if after_created_at is not None and after_id else None
+        analyses = await db_manager.list_analyses(limit, offset, after)
+        
+        next_cursor = None
+        if analyses and len(analyses) == limit:
+            last = analyses[-1]
+            next_cursor = {"after_created_at": last.created_at, "after_id": last.id}
+        
+        return UTCORJSONResponse({
             "analyses": [
                 {
                     "analysis_id": analysis.id,
@@ -282,14 +665,15 @@ async def list_analyses(limit: int = 10, offset: int = 0):
                     "query": analysis.query,
                     "analysis_type": analysis.analysis_type,
                     "filename": analysis.filename,
-                    "created_at": analysis.created_at.isoformat(),
-                    "updated_at": analysis.updated_at.isoformat()
+                    "created_at": ms_to_datetime(analysis.created_at),
+                    "updated_at": ms_to_datetime(analysis.updated_at)
                 }
                 for analysis in analyses
             ],
             "limit": limit,
-            "offset": offset
-        }
+            "offset": offset,
+            "next_cursor": next_cursor
+        })
         
     except Exception as e:
         logger.error(f"Error listing analyses: {str(e)}")
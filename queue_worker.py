@@ -1,69 +1,229 @@
 import asyncio
+import heapq
+import itertools
 import json
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
-from dataclasses import dataclass, asdict
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import threading
 import time
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str)
+    
+    _loads = json.loads
+
+# Leading byte of a zstd-compressed Redis payload; legacy entries are bare JSON and start with '{'
+_ZSTD_MAGIC = b"\x01"
+
+try:
+    import zstandard as zstd
+    
+    _CCTX = zstd.ZstdCompressor(level=3)
+    _DCTX = zstd.ZstdDecompressor()
+except ImportError:
+    _CCTX = _DCTX = None
+
+def _pack(obj) -> bytes:
+    """Encode a value for Redis, zstd-compressed behind a magic byte when zstandard is installed"""
+    raw = _dumps(obj)
+    if isinstance(raw, str):
+        raw = raw.encode()
+    if _CCTX is None:
+        return raw
+    return _ZSTD_MAGIC + _CCTX.compress(raw)
+
+def _unpack(raw: bytes):
+    """Decode a Redis payload written by _pack, accepting legacy uncompressed JSON"""
+    if raw[:1] == _ZSTD_MAGIC:
+        if _DCTX is None:
+            raise RuntimeError("zstandard is required to read compressed task payloads")
+        raw = _DCTX.decompress(raw[1:])
+    return _loads(raw)
+
+# Commands per pipeline round-trip when enqueueing in bulk
+REDIS_PIPELINE_CHUNK = 10000
+
+# Redis list of queued tasks, the list holding tasks a worker has claimed,
+# and a sorted set of claimed payloads scored by their last claim refresh (ms)
+_QUEUE_KEY = "blood_analysis_queue"
+_PROCESSING_KEY = "blood_analysis_processing"
+_CLAIMS_KEY = "blood_analysis_claims"
+
+# Claims not refreshed for this long are assumed orphaned by a dead worker;
+# consumers refresh theirs well inside this window while a task runs
+STALE_TASK_SECONDS = 300
+
+# Moves the oldest queued payload onto the processing list and stamps its claim
+# time in one atomic step, so a crash can never leave an unstamped claim
+_CLAIM_SCRIPT = """
+local payload = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+if payload then
+    redis.call('ZADD', KEYS[3], ARGV[1], payload)
+end
+return payload
+"""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+def as_iso(ns: int) -> str:
+    """Format unix epoch nanoseconds as an ISO-8601 UTC timestamp"""
+    return (_EPOCH + timedelta(microseconds=ns // 1000)).isoformat()
+
+def _now_ms() -> int:
+    """Current unix epoch time in milliseconds, the unit of claim scores"""
+    return time.time_ns() // 1_000_000
+
+def from_iso(value: str) -> int:
+    """Parse an ISO-8601 timestamp (naive means UTC) into unix epoch nanoseconds"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // timedelta(microseconds=1) * 1000
+
 class TaskStatus(Enum):
     QUEUED = "queued"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
 
-@dataclass
+# Plain string values for Redis writes, skipping the enum attribute lookup
+_STATUS_QUEUED = TaskStatus.QUEUED.value
+_STATUS_PROCESSING = TaskStatus.PROCESSING.value
+_STATUS_COMPLETED = TaskStatus.COMPLETED.value
+_STATUS_FAILED = TaskStatus.FAILED.value
+
+@dataclass(slots=True)
 class QueueTask:
     """Queue task data structure"""
     id: str
     task_type: str
     data: Dict
     status: TaskStatus
-    created_at: datetime
-    started_at: Optional[datetime] = None
-    completed_at: Optional[datetime] = None
+    created_at: int  # unix epoch nanoseconds
+    started_at: Optional[int] = None
+    completed_at: Optional[int] = None
     error_message: Optional[str] = None
     retry_count: int = 0
     max_retries: int = 3
+    priority: int = 0  # lower runs first; the Redis backend is FIFO only
+    
+    @classmethod
+    def acquire(cls, id: str, task_type: str, data: Dict, status: TaskStatus, created_at: int,
+                started_at: Optional[int] = None, retry_count: int = 0, max_retries: int = 3,
+                priority: int = 0) -> "QueueTask":
+        """Take a task from the free list, or build one if it is empty"""
+        try:
+            task = _TASK_POOL.pop()
+        except IndexError:
+            return cls(id, task_type, data, status, created_at, started_at,
+                       retry_count=retry_count, max_retries=max_retries, priority=priority)
+        
+        task.id = id
+        task.task_type = task_type
+        task.data = data
+        task.status = status
+        task.created_at = created_at
+        task.started_at = started_at
+        task.completed_at = None
+        task.error_message = None
+        task.retry_count = retry_count
+        task.max_retries = max_retries
+        task.priority = priority
+        return task
+    
+    @staticmethod
+    def release(task: "QueueTask"):
+        """Drop a finished task's references and return it to the free list"""
+        task.data = None
+        task.error_message = None
+        _TASK_POOL.append(task)
+
+# Recycled QueueTask instances; deque append/pop are atomic under the GIL
+_TASK_POOL: Deque[QueueTask] = deque(maxlen=4096)
 
 class InMemoryQueue:
     """In-memory queue implementation (for systems without Redis)"""
     
-    def __init__(self):
-        self.tasks: Dict[str, QueueTask] = {}
+    def __init__(self, history_cap: int = 10000):
+        # Heap of (priority, enqueue sequence, task) plus an id index. heappush/
+        # heappop on int-keyed tuples and dict get/set each run without releasing
+        # the GIL, so enqueue/dequeue take no lock. The unique sequence keeps FIFO
+        # order within a priority and means tasks themselves are never compared.
+        self._heap: List[Tuple[int, int, QueueTask]] = []
+        self._seq = itertools.count()
+        self._by_id: Dict[str, QueueTask] = {}
         self.processing_tasks: Dict[str, QueueTask] = {}
-        self.completed_tasks: Dict[str, QueueTask] = {}
-        self.failed_tasks: Dict[str, QueueTask] = {}
+        # Finished tasks, oldest first, capped at history_cap entries each
+        self.completed_tasks: "OrderedDict[str, QueueTask]" = OrderedDict()
+        self.failed_tasks: "OrderedDict[str, QueueTask]" = OrderedDict()
+        self._history_cap = history_cap
+        # Latest task object per id, whichever state it is in
+        self._index: Dict[str, QueueTask] = {}
+        # Guards the rarer processing -> completed/failed transitions
         self._lock = threading.Lock()
     
     def enqueue(self, task: QueueTask) -> bool:
         """Add task to queue"""
-        with self._lock:
-            self.tasks[task.id] = task
-            logger.info(f"Task {task.id} added to queue")
-            return True
+        # Index first so a consumer that pops the task can claim it
+        self._index[task.id] = task
+        self._by_id[task.id] = task
+        heapq.heappush(self._heap, (task.priority, next(self._seq), task))
+        logger.info(f"Task {task.id} added to queue")
+        return True
+    
+    def enqueue_many(self, tasks: List[QueueTask]) -> bool:
+        """Add many tasks to queue in one batch"""
+        self._index.update((task.id, task) for task in tasks)
+        self._by_id.update((task.id, task) for task in tasks)
+        for task in tasks:
+            heapq.heappush(self._heap, (task.priority, next(self._seq), task))
+        logger.info(f"{len(tasks)} tasks added to queue")
+        return True
     
     def dequeue(self) -> Optional[QueueTask]:
         """Get next task from queue"""
-        with self._lock:
-            if not self.tasks:
+        while True:
+            # Get the highest-priority, oldest task
+            try:
+                _, _, task = heapq.heappop(self._heap)
+            except IndexError:
                 return None
             
-            # Get oldest task
-            task_id = min(self.tasks.keys(), key=lambda x: self.tasks[x].created_at)
-            task = self.tasks.pop(task_id)
-            
-            # Move to processing
-            task.status = TaskStatus.PROCESSING
-            task.started_at = datetime.utcnow()
-            self.processing_tasks[task.id] = task
-            
-            logger.info(f"Task {task.id} dequeued for processing")
-            return task
+            # Lazy deletion: skip entries superseded by a later enqueue of the same id
+            if self._by_id.get(task.id) is task:
+                self._by_id.pop(task.id, None)
+                break
+        
+        # Move to processing
+        task.status = TaskStatus.PROCESSING
+        task.started_at = time.time_ns()
+        self.processing_tasks[task.id] = task
+        
+        logger.info(f"Task {task.id} dequeued for processing")
+        return task
+    
+    def _record_finished(self, history: "OrderedDict[str, QueueTask]", task: QueueTask):
+        """Keep a finished task, evicting and recycling the oldest past the cap"""
+        history[task.id] = task
+        while len(history) > self._history_cap:
+            evicted_id, evicted = history.popitem(last=False)
+            if self._index.get(evicted_id) is evicted:
+                del self._index[evicted_id]
+            QueueTask.release(evicted)
     
     def complete_task(self, task_id: str, result: Optional[str] = None) -> bool:
         """Mark task as completed"""
@@ -73,8 +233,8 @@ class InMemoryQueue:
             
             task = self.processing_tasks.pop(task_id)
             task.status = TaskStatus.COMPLETED
-            task.completed_at = datetime.utcnow()
-            self.completed_tasks[task_id] = task
+            task.completed_at = time.time_ns()
+            self._record_finished(self.completed_tasks, task)
             
             logger.info(f"Task {task_id} completed successfully")
             return True
@@ -87,7 +247,7 @@ class InMemoryQueue:
             
             task = self.processing_tasks.pop(task_id)
             task.status = TaskStatus.FAILED
-            task.completed_at = datetime.utcnow()
+            task.completed_at = time.time_ns()
             task.error_message = error_message
             task.retry_count += 1
             
@@ -96,42 +256,55 @@ class InMemoryQueue:
                 task.status = TaskStatus.QUEUED
                 task.started_at = None
                 task.completed_at = None
-                self.tasks[task_id] = task
+                self._by_id[task_id] = task
+                heapq.heappush(self._heap, (task.priority, next(self._seq), task))
                 logger.info(f"Task {task_id} queued for retry ({task.retry_count}/{task.max_retries})")
             else:
-                self.failed_tasks[task_id] = task
+                self._record_finished(self.failed_tasks, task)
                 logger.error(f"Task {task_id} failed permanently: {error_message}")
             
             return True
     
     def get_task_status(self, task_id: str) -> Optional[QueueTask]:
-        """Get task status"""
+        """Get a snapshot of a task's status
+        
+        Returns a copy: the stored task goes back to the free list once it is
+        evicted from history, and a later acquire() would rewrite it in place.
+        """
         with self._lock:
-            # Check all queues
-            for queue in [self.tasks, self.processing_tasks, self.completed_tasks, self.failed_tasks]:
-                if task_id in queue:
-                    return queue[task_id]
-            return None
+            task = self._index.get(task_id)
+            return replace(task) if task is not None else None
     
     def get_queue_stats(self) -> Dict:
         """Get queue statistics"""
         with self._lock:
             return {
-                "queued": len(self.tasks),
+                "queued": len(self._by_id),
                 "processing": len(self.processing_tasks),
                 "completed": len(self.completed_tasks),
                 "failed": len(self.failed_tasks),
-                "total": len(self.tasks) + len(self.processing_tasks) + len(self.completed_tasks) + len(self.failed_tasks)
+                "total": len(self._by_id) + len(self.processing_tasks) + len(self.completed_tasks) + len(self.failed_tasks)
             }
 
 class RedisQueue:
     """Redis-based queue implementation (optional)"""
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self, redis_url: str = "redis://localhost:6379", protocol: int = 2):
         try:
-            import redis
-            self.redis_client = redis.from_url(redis_url)
+            import redis.asyncio as redis_asyncio
+            try:
+                import hiredis  # noqa: F401  redis-py uses its C reply parser when installed
+            except ImportError:
+                logger.info("hiredis not installed, Redis replies use the pure-Python parser")
+            
+            # RESP3 (protocol=3) needs redis-py 5+ and Redis 6+; only pass it when asked for
+            options = {"protocol": protocol} if protocol != 2 else {}
+            # Every command is awaited on the event loop, never on a thread
+            self.redis_client = redis_asyncio.from_url(redis_url, **options)
+            self._claim = self.redis_client.register_script(_CLAIM_SCRIPT)
             self.redis_available = True
+            # Raw payloads of tasks this process claimed, for removal from the processing list
+            self._claimed: Dict[str, bytes] = {}
             logger.info("Redis queue initialized successfully")
         except ImportError:
             logger.warning("Redis not available, falling back to in-memory queue")
@@ -140,27 +313,35 @@ class RedisQueue:
             logger.error(f"Redis connection failed: {str(e)}")
             self.redis_available = False
     
-    def enqueue(self, task: QueueTask) -> bool:
+    def _pipe_enqueue(self, pipe, task: QueueTask):
+        """Add the commands that store and queue a task to a pipeline"""
+        task_data = {
+            "id": task.id,
+            "task_type": task.task_type,
+            "data": task.data,
+            "status": task.status.value,
+            "created_at": as_iso(task.created_at),
+            "retry_count": task.retry_count,
+            "max_retries": task.max_retries
+        }
+        
+        # Store task details; hash fields are flat, so the payload goes in as encoded JSON.
+        # Ids repeat for identical requests, so drop an earlier attempt's fields first
+        pipe.delete(f"task:{task.id}")
+        pipe.hset(f"task:{task.id}", mapping={**task_data, "data": _pack(task.data)})
+        
+        # Add to queue once the hash is in place, so a claim never lands before it
+        pipe.lpush(_QUEUE_KEY, _pack(task_data))
+    
+    async def enqueue(self, task: QueueTask) -> bool:
         """Add task to Redis queue"""
         if not self.redis_available:
             return False
         
         try:
-            task_data = {
-                "id": task.id,
-                "task_type": task.task_type,
-                "data": task.data,
-                "status": task.status.value,
-                "created_at": task.created_at.isoformat(),
-                "retry_count": task.retry_count,
-                "max_retries": task.max_retries
-            }
-            
-            # Add to queue
-            self.redis_client.lpush("blood_analysis_queue", json.dumps(task_data))
-            
-            # Store task details
-            self.redis_client.hset(f"task:{task.id}", mapping=task_data)
+            pipe = self.redis_client.pipeline(transaction=False)
+            self._pipe_enqueue(pipe, task)
+            await pipe.execute()
             
             logger.info(f"Task {task.id} added to Redis queue")
             return True
@@ -169,34 +350,59 @@ class RedisQueue:
             logger.error(f"Error adding task to Redis queue: {str(e)}")
             return False
     
-    def dequeue(self) -> Optional[QueueTask]:
+    async def enqueue_many(self, tasks: List[QueueTask]) -> bool:
+        """Add many tasks to Redis queue, one round-trip per pipeline chunk"""
+        if not self.redis_available:
+            return False
+        
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for start in range(0, len(tasks), REDIS_PIPELINE_CHUNK):
+                for task in tasks[start:start + REDIS_PIPELINE_CHUNK]:
+                    self._pipe_enqueue(pipe, task)
+                await pipe.execute()
+            
+            logger.info(f"{len(tasks)} tasks added to Redis queue")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error adding tasks to Redis queue: {str(e)}")
+            return False
+    
+    async def dequeue(self) -> Optional[QueueTask]:
         """Get next task from Redis queue"""
         if not self.redis_available:
             return None
         
         try:
-            # Get task from queue
-            task_data = self.redis_client.brpop("blood_analysis_queue", timeout=1)
-            if not task_data:
+            # Atomically claim the oldest task, so a worker crash at any point
+            # leaves it stamped on the processing list for recovery
+            payload = await self._claim(keys=[_QUEUE_KEY, _PROCESSING_KEY, _CLAIMS_KEY], args=[_now_ms()])
+            if not payload:
                 return None
             
-            task_json = json.loads(task_data[1])
+            # A payload that cannot be decoded stays claimed and is requeued once stale
+            task_json = _unpack(payload)
             
             # Create QueueTask object
-            task = QueueTask(
+            task = QueueTask.acquire(
                 id=task_json["id"],
                 task_type=task_json["task_type"],
                 data=task_json["data"],
                 status=TaskStatus.PROCESSING,
-                created_at=datetime.fromisoformat(task_json["created_at"]),
-                started_at=datetime.utcnow(),
+                created_at=from_iso(task_json["created_at"]),
+                started_at=time.time_ns(),
                 retry_count=task_json["retry_count"],
                 max_retries=task_json["max_retries"]
             )
             
-            # Update task status in Redis
-            self.redis_client.hset(f"task:{task.id}", "status", TaskStatus.PROCESSING.value)
-            self.redis_client.hset(f"task:{task.id}", "started_at", task.started_at.isoformat())
+            self._claimed[task.id] = payload
+            
+            # Update task status in Redis; informational, recovery goes by the claim time
+            await self.redis_client.hset(f"task:{task.id}", mapping={
+                "status": _STATUS_PROCESSING,
+                "started_at": as_iso(task.started_at)
+            })
             
             logger.info(f"Task {task.id} dequeued from Redis")
             return task
@@ -204,15 +410,139 @@ class RedisQueue:
         except Exception as e:
             logger.error(f"Error dequeuing task from Redis: {str(e)}")
             return None
+    
+    async def close(self):
+        """Close the client's connection pool"""
+        if self.redis_available:
+            # aclose() arrived in redis-py 5.0.1; 4.x only has the now-deprecated close()
+            close = getattr(self.redis_client, "aclose", None) or self.redis_client.close
+            await close()
+    
+    async def finish(self, task_id: str, fields: Dict):
+        """Record a claimed task's final fields and drop it from the processing list"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hset(f"task:{task_id}", mapping=fields)
+        payload = self._claimed.pop(task_id, None)
+        if payload is not None:
+            pipe.lrem(_PROCESSING_KEY, 1, payload)
+            pipe.zrem(_CLAIMS_KEY, payload)
+        await pipe.execute()
+    
+    async def touch(self, task_id: str) -> bool:
+        """Refresh the claim time of a task this process is still working on"""
+        payload = self._claimed.get(task_id)
+        if payload is None:
+            return False
+        
+        try:
+            await self.redis_client.zadd(_CLAIMS_KEY, {payload: _now_ms()}, xx=True)
+            return True
+        except Exception as e:
+            logger.error(f"Error refreshing Redis task claim: {str(e)}")
+            return False
+    
+    async def recover_stale(self, max_age_seconds: float = STALE_TASK_SECONDS,
+                            can_resume: Optional[Callable[[Dict], bool]] = None) -> Tuple[int, List[str]]:
+        """Requeue claimed tasks whose worker stopped refreshing the claim
+        
+        Tasks whose data fails can_resume are marked failed instead. Returns
+        the number requeued and the ids of the tasks failed.
+        """
+        if not self.redis_available:
+            return 0, []
+        
+        try:
+            payloads = await self.redis_client.lrange(_PROCESSING_KEY, 0, -1)
+            if not payloads:
+                return 0, []
+            
+            pipe = self.redis_client.pipeline(transaction=False)
+            for payload in payloads:
+                pipe.zscore(_CLAIMS_KEY, payload)
+            scores = await pipe.execute()
+            
+            now = _now_ms()
+            cutoff = now - max_age_seconds * 1000
+            stale = [payload for payload, score in zip(payloads, scores) if score is not None and score < cutoff]
+            
+            # Entries without a claim time (claimed before claims were stamped)
+            # start ageing now, so they come back one max_age later
+            unstamped = {payload: now for payload, score in zip(payloads, scores) if score is None}
+            if unstamped:
+                await self.redis_client.zadd(_CLAIMS_KEY, unstamped, nx=True)
+            if not stale:
+                return 0, []
+            
+            # Only touch entries this call actually removed, so concurrent
+            # recoveries cannot requeue the same task twice
+            for payload in stale:
+                pipe.lrem(_PROCESSING_KEY, 1, payload)
+            removed = await pipe.execute()
+            
+            recovered, failed = 0, []
+            for payload, count in zip(stale, removed):
+                if not count:
+                    continue
+                pipe.zrem(_CLAIMS_KEY, payload)
+                
+                try:
+                    task_json = _unpack(payload)
+                    task_id = task_json["id"]
+                except Exception as e:
+                    # Requeue it untouched; a worker that can decode it will pick it up
+                    logger.error(f"Requeueing an undecodable stale task as-is: {str(e)}")
+                    pipe.rpush(_QUEUE_KEY, payload)
+                    recovered += 1
+                    continue
+                
+                if can_resume is None or can_resume(task_json["data"]):
+                    # Clear the dead claim's started_at before the task is claimed again
+                    pipe.hdel(f"task:{task_id}", "started_at")
+                    pipe.hset(f"task:{task_id}", "status", _STATUS_QUEUED)
+                    pipe.rpush(_QUEUE_KEY, payload)
+                    recovered += 1
+                else:
+                    pipe.hset(f"task:{task_id}", mapping={
+                        "status": _STATUS_FAILED,
+                        "completed_at": as_iso(time.time_ns()),
+                        "error_message": "Abandoned by its worker and cannot be resumed"
+                    })
+                    failed.append(task_id)
+            await pipe.execute()
+            
+            if recovered:
+                logger.warning(f"Requeued {recovered} stale tasks from the Redis processing list")
+            if failed:
+                logger.warning(f"Failed {len(failed)} stale tasks that cannot be resumed")
+            return recovered, failed
+            
+        except Exception as e:
+            logger.error(f"Error recovering stale Redis tasks: {str(e)}")
+            return 0, []
+
+def _task_from_hash(task_data: Dict[bytes, bytes]) -> QueueTask:
+    """Rebuild a QueueTask from its Redis task hash"""
+    return QueueTask(
+        id=task_data[b"id"].decode(),
+        task_type=task_data[b"task_type"].decode(),
+        data=_unpack(task_data[b"data"]),
+        status=TaskStatus(task_data[b"status"].decode()),
+        created_at=from_iso(task_data[b"created_at"].decode()),
+        started_at=from_iso(task_data[b"started_at"].decode()) if b"started_at" in task_data else None,
+        completed_at=from_iso(task_data[b"completed_at"].decode()) if b"completed_at" in task_data else None,
+        error_message=task_data[b"error_message"].decode() if b"error_message" in task_data else None,
+        retry_count=int(task_data[b"retry_count"].decode()),
+        max_retries=int(task_data[b"max_retries"].decode())
+    )
 
 class QueueManager:
     """Queue manager that handles both in-memory and Redis queues"""
     
-    def __init__(self, redis_url: Optional[str] = None):
+    def __init__(self, redis_url: Optional[str] = None, redis_protocol: int = 2):
         self.in_memory_queue = InMemoryQueue()
         
         if redis_url:
-            self.redis_queue = RedisQueue(redis_url)
+            self.redis_queue = RedisQueue(redis_url, protocol=redis_protocol)
             self.use_redis = self.redis_queue.redis_available
         else:
             self.redis_queue = None
@@ -223,36 +553,68 @@ class QueueManager:
         else:
             logger.info("QueueManager initialized with in-memory backend")
     
-    def enqueue_task(self, task_id: str, task_type: str, data: Dict) -> bool:
+    async def enqueue_task(self, task_id: str, task_type: str, data: Dict, priority: int = 0) -> bool:
         """Add task to appropriate queue"""
-        task = QueueTask(
+        task = QueueTask.acquire(
             id=task_id,
             task_type=task_type,
             data=data,
             status=TaskStatus.QUEUED,
-            created_at=datetime.utcnow()
+            created_at=time.time_ns(),
+            priority=priority
         )
         
         if self.use_redis:
-            return self.redis_queue.enqueue(task)
+            # Redis keeps the serialized copy, so the object can be reused
+            queued = await self.redis_queue.enqueue(task)
+            QueueTask.release(task)
+            return queued
         else:
             return self.in_memory_queue.enqueue(task)
     
-    def get_next_task(self) -> Optional[QueueTask]:
+    async def enqueue_many(self, task_specs: Iterable[Tuple[str, str, Dict]]) -> bool:
+        """Add many (task_id, task_type, data) tasks to appropriate queue in one batch"""
+        created_at = time.time_ns()
+        tasks = [
+            QueueTask.acquire(
+                id=task_id,
+                task_type=task_type,
+                data=data,
+                status=TaskStatus.QUEUED,
+                created_at=created_at
+            )
+            for task_id, task_type, data in task_specs
+        ]
+        if not tasks:
+            return True
+        
+        if self.use_redis:
+            queued = await self.redis_queue.enqueue_many(tasks)
+            for task in tasks:
+                QueueTask.release(task)
+            return queued
+        else:
+            return self.in_memory_queue.enqueue_many(tasks)
+    
+    async def get_next_task(self) -> Optional[QueueTask]:
         """Get next task for processing"""
         if self.use_redis:
-            return self.redis_queue.dequeue()
+            return await self.redis_queue.dequeue()
         else:
+            # Completes without suspending, so an eager task never yields here
             return self.in_memory_queue.dequeue()
     
-    def complete_task(self, task_id: str, result: Optional[str] = None) -> bool:
+    async def complete_task(self, task_id: str, result: Optional[str] = None) -> bool:
         """Mark task as completed"""
         if self.use_redis:
             try:
-                self.redis_queue.redis_client.hset(f"task:{task_id}", "status", TaskStatus.COMPLETED.value)
-                self.redis_queue.redis_client.hset(f"task:{task_id}", "completed_at", datetime.utcnow().isoformat())
+                fields = {
+                    "status": _STATUS_COMPLETED,
+                    "completed_at": as_iso(time.time_ns())
+                }
                 if result:
-                    self.redis_queue.redis_client.hset(f"task:{task_id}", "result", result)
+                    fields["result"] = result
+                await self.redis_queue.finish(task_id, fields)
                 return True
             except Exception as e:
                 logger.error(f"Error completing Redis task: {str(e)}")
@@ -260,13 +622,15 @@ class QueueManager:
         else:
             return self.in_memory_queue.complete_task(task_id, result)
     
-    def fail_task(self, task_id: str, error_message: str) -> bool:
+    async def fail_task(self, task_id: str, error_message: str) -> bool:
         """Mark task as failed"""
         if self.use_redis:
             try:
-                self.redis_queue.redis_client.hset(f"task:{task_id}", "status", TaskStatus.FAILED.value)
-                self.redis_queue.redis_client.hset(f"task:{task_id}", "completed_at", datetime.utcnow().isoformat())
-                self.redis_queue.redis_client.hset(f"task:{task_id}", "error_message", error_message)
+                await self.redis_queue.finish(task_id, {
+                    "status": _STATUS_FAILED,
+                    "completed_at": as_iso(time.time_ns()),
+                    "error_message": error_message
+                })
                 return True
             except Exception as e:
                 logger.error(f"Error failing Redis task: {str(e)}")
@@ -274,41 +638,68 @@ class QueueManager:
         else:
             return self.in_memory_queue.fail_task(task_id, error_message)
     
-    def get_task_status(self, task_id: str) -> Optional[QueueTask]:
+    async def close(self):
+        """Release Redis connections held by the queue"""
+        if self.use_redis:
+            await self.redis_queue.close()
+    
+    async def touch_task(self, task_id: str) -> bool:
+        """Keep a running task's claim fresh so recovery leaves it alone"""
+        if self.use_redis:
+            return await self.redis_queue.touch(task_id)
+        return True
+    
+    async def recover_stale_tasks(self, max_age_seconds: float = STALE_TASK_SECONDS,
+                                  can_resume: Optional[Callable[[Dict], bool]] = None) -> Tuple[int, List[str]]:
+        """Requeue Redis tasks orphaned by workers that died mid-task, failing those that cannot resume"""
+        if self.use_redis:
+            return await self.redis_queue.recover_stale(max_age_seconds, can_resume)
+        return 0, []
+    
+    async def get_task_status(self, task_id: str) -> Optional[QueueTask]:
         """Get task status"""
         if self.use_redis:
             try:
-                task_data = self.redis_queue.redis_client.hgetall(f"task:{task_id}")
-                if not task_data:
-                    return None
-                
-                return QueueTask(
-                    id=task_data[b"id"].decode(),
-                    task_type=task_data[b"task_type"].decode(),
-                    data=json.loads(task_data[b"data"].decode()),
-                    status=TaskStatus(task_data[b"status"].decode()),
-                    created_at=datetime.fromisoformat(task_data[b"created_at"].decode()),
-                    started_at=datetime.fromisoformat(task_data[b"started_at"].decode()) if b"started_at" in task_data else None,
-                    completed_at=datetime.fromisoformat(task_data[b"completed_at"].decode()) if b"completed_at" in task_data else None,
-                    error_message=task_data[b"error_message"].decode() if b"error_message" in task_data else None,
-                    retry_count=int(task_data[b"retry_count"].decode()),
-                    max_retries=int(task_data[b"max_retries"].decode())
-                )
+                task_data = await self.redis_queue.redis_client.hgetall(f"task:{task_id}")
+                return _task_from_hash(task_data) if task_data else None
             except Exception as e:
                 logger.error(f"Error getting Redis task status: {str(e)}")
                 return None
         else:
             return self.in_memory_queue.get_task_status(task_id)
     
-    def get_queue_stats(self) -> Dict:
+    async def get_many_statuses(self, task_ids: List[str]) -> Dict[str, Optional[QueueTask]]:
+        """Get the status of many tasks, in one Redis round-trip when on Redis"""
+        if self.use_redis:
+            try:
+                pipe = self.redis_queue.redis_client.pipeline(transaction=False)
+                for task_id in task_ids:
+                    pipe.hgetall(f"task:{task_id}")
+                results = await pipe.execute()
+                
+                return {
+                    task_id: _task_from_hash(task_data) if task_data else None
+                    for task_id, task_data in zip(task_ids, results)
+                }
+            except Exception as e:
+                logger.error(f"Error getting Redis task statuses: {str(e)}")
+                return {task_id: None for task_id in task_ids}
+        else:
+            lookup = self.in_memory_queue.get_task_status
+            return {task_id: lookup(task_id) for task_id in task_ids}
+    
+    async def get_queue_stats(self) -> Dict:
         """Get queue statistics"""
         if self.use_redis:
             try:
-                queue_length = self.redis_queue.redis_client.llen("blood_analysis_queue")
+                pipe = self.redis_queue.redis_client.pipeline(transaction=False)
+                pipe.llen(_QUEUE_KEY)
+                pipe.llen(_PROCESSING_KEY)
+                queue_length, processing_length = await pipe.execute()
                 return {
                     "backend": "redis",
                     "queued": queue_length,
-                    "processing": "N/A",  # Would need separate tracking
+                    "processing": processing_length,
                     "completed": "N/A",
                     "failed": "N/A"
                 }
@@ -320,11 +711,11 @@ class QueueManager:
             stats["backend"] = "in-memory"
             return stats
     
-    def health_check(self) -> Dict:
+    async def health_check(self) -> Dict:
         """Queue health check"""
         try:
             if self.use_redis:
-                self.redis_queue.redis_client.ping()
+                await self.redis_queue.redis_client.ping()
                 return {"status": "healthy", "backend": "redis"}
             else:
                 return {"status": "healthy", "backend": "in-memory"}
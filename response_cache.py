@@ -0,0 +1,99 @@
+import asyncio
+import logging
+import math
+from array import array
+from typing import List, Optional
+
+from database import DatabaseManager
+
+logger = logging.getLogger(__name__)
+
+def normalize_query(query: str) -> str:
+    """Collapse case and whitespace so trivially different queries share a key"""
+    return " ".join(query.lower().split())
+
+class ResponseCache:
+    """Exact + semantic cache for crew results, keyed by report hash"""
+    
+    def __init__(self, db_manager: DatabaseManager, similarity_threshold: float = 0.95,
+                 model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+        self.db_manager = db_manager
+        self.similarity_threshold = similarity_threshold
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = asyncio.Lock()
+        
+        try:
+            import sentence_transformers  # noqa: F401
+            self.semantic_available = True
+        except ImportError:
+            logger.warning("sentence-transformers not available, response cache will use exact matches only")
+            self.semantic_available = False
+    
+    @staticmethod
+    def make_key(file_hash: str, analysis_type: str, query: str) -> str:
+        """Build the exact-match cache key"""
+        return f"{file_hash}:{analysis_type}:{normalize_query(query)}"
+    
+    async def _embed(self, query: str) -> Optional[List[float]]:
+        """Embed a normalized query, loading the model on first use"""
+        if not self.semantic_available:
+            return None
+        
+        try:
+            async with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = await asyncio.to_thread(SentenceTransformer, self.model_name)
+            
+            vector = await asyncio.to_thread(
+                self._model.encode, normalize_query(query), normalize_embeddings=True
+            )
+            return [float(x) for x in vector]
+        except Exception as e:
+            logger.error(f"Error computing query embedding: {str(e)}")
+            return None
+    
+    async def lookup(self, file_hash: str, query: str, analysis_type: str) -> Optional[str]:
+        """Return a cached result for an identical or near-identical request"""
+        result = await self.db_manager.get_cached_result(self.make_key(file_hash, analysis_type, query))
+        if result is not None:
+            logger.info(f"Response cache hit (exact) for {file_hash[:12]}")
+            return result
+        
+        if not self.semantic_available:
+            return None
+        
+        candidates = await self.db_manager.list_cached_embeddings(file_hash, analysis_type)
+        if not candidates:
+            return None
+        
+        query_vector = await self._embed(query)
+        if query_vector is None:
+            return None
+        
+        best_score, best_result = 0.0, None
+        for blob, cached_result in candidates:
+            cached_vector = array('f')
+            cached_vector.frombytes(blob)
+            # Embeddings are stored normalized, so the dot product is the cosine
+            score = math.fsum(a * b for a, b in zip(query_vector, cached_vector))
+            if score > best_score:
+                best_score, best_result = score, cached_result
+        
+        if best_score >= self.similarity_threshold:
+            logger.info(f"Response cache hit (semantic, {best_score:.3f}) for {file_hash[:12]}")
+            return best_result
+        return None
+    
+    async def store(self, file_hash: str, query: str, analysis_type: str, result: str) -> bool:
+        """Cache a successful crew result"""
+        vector = await self._embed(query)
+        embedding = array('f', vector).tobytes() if vector is not None else None
+        return await self.db_manager.store_cached_result(
+            self.make_key(file_hash, analysis_type, query),
+            file_hash,
+            analysis_type,
+            embedding,
+            result
+        )
@@ -7,6 +7,8 @@ from tools import search_tool, BloodTestReportTool, NutritionTool, ExerciseTool
 help_patients = Task(
     description="""Analyze the uploaded blood test report and provide comprehensive medical insights for the user's query: {query}
     
+    Blood test report file: {file_path}
+    
     Instructions:
     1. First, read and analyze the blood test report thoroughly
     2. Identify key blood markers and their values
@@ -53,6 +55,8 @@ help_patients = Task(
 verification_task = Task(
     description="""Verify that the uploaded document is a valid blood test report containing analyzable medical data.
     
+    Blood test report file: {file_path}
+    
     Instructions:
     1. Read the uploaded document thoroughly
     2. Check if it contains blood test results with numerical values
@@ -83,6 +87,11 @@ nutrition_analysis = Task(
     
     User query: {query}
     
+    Blood test report file: {file_path}
+    
+    Doctor's review of the report:
+    {medical_context}
+    
     Instructions:
     1. Review blood markers relevant to nutritional status
     2. Identify potential nutritional deficiencies or excesses
@@ -125,6 +134,11 @@ exercise_planning = Task(
     
     User query: {query}
     
+    Blood test report file: {file_path}
+    
+    Doctor's review of the report:
+    {medical_context}
+    
     Instructions:
     1. Analyze blood markers relevant to exercise capacity and safety
     2. Consider cardiovascular health indicators
@@ -7,12 +7,114 @@ from crewai.tools import BaseTool
 from crewai_tools import SerperDevTool
 from langchain_community.document_loaders import PyPDFLoader
 import pandas as pd
-from typing import Type
+import logging
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple, Type
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 ## Creating search tool
 search_tool = SerperDevTool()
 
+## Shared PDF text
+# Reports pre-extracted for an in-flight analysis, keyed by normalized file path
+_PRELOADED_REPORTS: Dict[str, str] = {}
+# Recently extracted reports keyed by file hash, so re-uploads skip parsing
+_REPORTS_BY_HASH: OrderedDict = OrderedDict()
+_REPORTS_BY_HASH_SIZE = 32
+_report_lock = threading.Lock()
+
+# Runs of newlines collapsed when cleaning extracted pages
+_BLANK_LINES = re.compile(r"\n{2,}")
+
+def extract_report_text(file_path: str) -> str:
+    """Parse a PDF and return its cleaned text content"""
+    loader = PyPDFLoader(file_path)
+    docs = loader.load()
+
+    parts = []
+    for doc in docs:
+        # Clean and format the report data: collapse blank-line runs, trim edges
+        parts.append(_BLANK_LINES.sub("\n", doc.page_content).strip())
+    
+    return "\n".join(parts) + "\n" if parts else ""
+
+class _EmptyReport(Exception):
+    """Raised by _load_pdf so empty extractions are not memoized"""
+
+# Upload paths are unique and deleted after each analysis, so only the few
+# in flight are worth keeping; repeat uploads hit _REPORTS_BY_HASH instead
+@lru_cache(maxsize=8)
+def _load_pdf(path: str, mtime_ns: int, size: int) -> str:
+    """Parse a PDF once per (path, mtime, size)"""
+    logger.debug(f"Reading PDF from: {path}")
+    report = extract_report_text(path)
+    if not report.strip():
+        raise _EmptyReport(path)
+    return report
+
+def read_report(file_path: str) -> str:
+    """Extract report text, reusing the last parse while the file is unchanged"""
+    stat = os.stat(file_path)
+    try:
+        return _load_pdf(os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    except _EmptyReport:
+        return ""
+
+def load_report_text(file_path: str, file_hash: Optional[str] = None) -> str:
+    """Extract report text, reusing a previous parse of the same file hash"""
+    if file_hash:
+        with _report_lock:
+            if file_hash in _REPORTS_BY_HASH:
+                _REPORTS_BY_HASH.move_to_end(file_hash)
+                return _REPORTS_BY_HASH[file_hash]
+    
+    report = read_report(file_path)
+    
+    if file_hash and report.strip():
+        with _report_lock:
+            _REPORTS_BY_HASH[file_hash] = report
+            while len(_REPORTS_BY_HASH) > _REPORTS_BY_HASH_SIZE:
+                _REPORTS_BY_HASH.popitem(last=False)
+    return report
+
+def preload_report(file_path: str, report: str):
+    """Make already-extracted text available to BloodTestReportTool for this path"""
+    with _report_lock:
+        _PRELOADED_REPORTS[os.path.normpath(file_path)] = report
+
+def discard_report(file_path: str):
+    """Drop preloaded text once the analysis using it is finished"""
+    with _report_lock:
+        _PRELOADED_REPORTS.pop(os.path.normpath(file_path), None)
+
+## Resolving report paths
+# Directories probed for reports, in lookup order
+_SEARCH_DIRS = (".", "data", "uploads", "files")
+
+def _candidate_paths(path: str) -> List[str]:
+    """Locations tried for a report path, most specific first"""
+    return [
+        path,  # Original path as provided
+        f"data/{path}",  # Check in data folder
+        f"./{path}",  # Check in current directory
+        f"uploads/{path}",  # Check in uploads folder
+        f"files/{path}",  # Check in files folder
+        "data/sample.pdf",  # Default fallback
+    ]
+
+@lru_cache(maxsize=256)
+def _resolve_pdf_path(path: str) -> Optional[str]:
+    """First existing candidate for a report path, or None"""
+    for candidate in _candidate_paths(path):
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
 ## Creating custom pdf reader tool
 class BloodTestReportInput(BaseModel):
     """Input schema for BloodTestReportTool."""
@@ -33,27 +135,15 @@ class BloodTestReportTool(BaseTool):
             str: Full Blood Test report content
         """
         try:
-            # List of possible paths to check
-            possible_paths = [
-                path,  # Original path as provided
-                f"data/{path}",  # Check in data folder
-                f"./{path}",  # Check in current directory
-                f"uploads/{path}",  # Check in uploads folder
-                f"files/{path}",  # Check in files folder
-                "data/sample.pdf",  # Default fallback
-            ]
-            
             # Find the first existing file
-            file_path = None
-            for p in possible_paths:
-                if os.path.exists(p):
-                    file_path = p
-                    break
+            file_path = _resolve_pdf_path(path)
             
             if not file_path:
+                possible_paths = _candidate_paths(path)
+                
                 # List available files for debugging
                 available_files = []
-                for folder in [".", "data", "uploads", "files"]:
+                for folder in _SEARCH_DIRS:
                     if os.path.exists(folder):
                         files = [f for f in os.listdir(folder) if f.endswith('.pdf')]
                         if files:
@@ -67,19 +157,17 @@ class BloodTestReportTool(BaseTool):
                 
                 return error_msg
             
-            print(f"Reading PDF from: {file_path}")  # Debug info
+            # Reuse text the pipeline already extracted for this upload
+            with _report_lock:
+                full_report = _PRELOADED_REPORTS.get(os.path.normpath(file_path))
             
-            loader = PyPDFLoader(file_path)
-            docs = loader.load()
-
-            full_report = ""
-            for doc in docs:
-                # Clean and format the report data
-                content = doc.page_content
-                
-                # Remove extra whitespaces and format properly
-                content = content.replace('\n\n', '\n').strip()
-                full_report += content + "\n"
+            if full_report is None:
+                try:
+                    full_report = read_report(file_path)
+                except FileNotFoundError:
+                    # Resolved earlier but removed since; forget stale resolutions
+                    _resolve_pdf_path.cache_clear()
+                    raise
                 
             if not full_report.strip():
                 return f"Error: Could not extract content from PDF file at {file_path}"
@@ -89,6 +177,52 @@ class BloodTestReportTool(BaseTool):
         except Exception as e:
             return f"Error reading PDF file: {str(e)}\nAttempted path: {path}"
 
+## Keyword markers scanned by the analysis tools
+# Keywords per blood marker; one named group per marker in a single pattern
+_MARKER_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "hemoglobin": ("hemoglobin", "hgb"),
+    "vitamin_d": ("vitamin d", "25(oh)d"),
+    "b12": ("b12", "cobalamin"),
+    "glucose": ("glucose",),
+    "cholesterol": ("cholesterol", "ldl"),
+    "blood_pressure": ("blood pressure", "bp"),
+}
+_MARKER_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{name}>{'|'.join(re.escape(keyword) for keyword in keywords)})"
+        for name, keywords in _MARKER_KEYWORDS.items()
+    ),
+    re.IGNORECASE
+)
+
+@lru_cache(maxsize=8)
+def _markers_in(text: str) -> FrozenSet[str]:
+    """Markers mentioned in a report, scanned once and shared by both tools"""
+    found = set()
+    for match in _MARKER_PATTERN.finditer(text):
+        found.add(match.lastgroup)
+        if len(found) == len(_MARKER_KEYWORDS):
+            break
+    return frozenset(found)
+
+def _findings(text: str, findings: Tuple[Tuple[str, str], ...]) -> List[str]:
+    """Findings for the markers present in the report, in table order"""
+    found = _markers_in(text)
+    return [finding for name, finding in findings if name in found]
+
+_NUTRITION_FINDINGS = (
+    ("hemoglobin", "Hemoglobin levels analyzed for iron status"),
+    ("vitamin_d", "Vitamin D levels reviewed"),
+    ("b12", "Vitamin B12 status evaluated"),
+    ("glucose", "Blood glucose levels assessed for metabolic health"),
+)
+
+_EXERCISE_FINDINGS = (
+    ("glucose", "Cardiovascular exercise recommended for glucose management"),
+    ("cholesterol", "Aerobic exercise beneficial for cholesterol management"),
+    ("blood_pressure", "Moderate exercise recommended for blood pressure control"),
+)
+
 ## Creating Nutrition Analysis Tool Input Schema
 class NutritionAnalysisInput(BaseModel):
     """Input schema for NutritionTool."""
@@ -109,21 +243,8 @@ class NutritionTool(BaseTool):
             str: Nutritional analysis and recommendations
         """
         try:
-            # Basic analysis of common blood markers for nutrition
-            analysis = []
-            
-            # Check for common nutritional markers
-            if "hemoglobin" in blood_report_data.lower() or "hgb" in blood_report_data.lower():
-                analysis.append("Hemoglobin levels analyzed for iron status")
-            
-            if "vitamin d" in blood_report_data.lower() or "25(oh)d" in blood_report_data.lower():
-                analysis.append("Vitamin D levels reviewed")
-                
-            if "b12" in blood_report_data.lower() or "cobalamin" in blood_report_data.lower():
-                analysis.append("Vitamin B12 status evaluated")
-                
-            if "glucose" in blood_report_data.lower():
-                analysis.append("Blood glucose levels assessed for metabolic health")
+            # Check for common nutritional markers in one scan
+            analysis = _findings(blood_report_data, _NUTRITION_FINDINGS)
                 
             if not analysis:
                 analysis.append("Blood report processed for nutritional markers")
@@ -153,17 +274,8 @@ class ExerciseTool(BaseTool):
             str: Exercise planning recommendations
         """
         try:
-            recommendations = []
-            
-            # Basic exercise recommendations based on common markers
-            if "glucose" in blood_report_data.lower():
-                recommendations.append("Cardiovascular exercise recommended for glucose management")
-                
-            if "cholesterol" in blood_report_data.lower() or "ldl" in blood_report_data.lower():
-                recommendations.append("Aerobic exercise beneficial for cholesterol management")
-                
-            if "blood pressure" in blood_report_data.lower() or "bp" in blood_report_data.lower():
-                recommendations.append("Moderate exercise recommended for blood pressure control")
+            # Basic exercise recommendations based on common markers, in one scan
+            recommendations = _findings(blood_report_data, _EXERCISE_FINDINGS)
                 
             if not recommendations:
                 recommendations.append("General fitness assessment completed based on blood markers")
@@ -0,0 +1,38 @@
+## Standalone queue worker: runs analysis jobs outside the API process
+import asyncio
+import os
+
+from main import (
+    db_manager, queue_manager, queue_consumer, queue_maintenance, install_crew_executor,
+    start_log_listener, stop_log_listener
+)
+
+# Concurrent analyses handled by this worker process
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "4"))
+
+def install_eager_task_factory():
+    """Start new tasks eagerly, skipping a loop round-trip when they finish synchronously (Python 3.12+)"""
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+async def run_worker(concurrency: int):
+    """Consume analysis jobs from the shared Redis queue"""
+    install_eager_task_factory()
+    start_log_listener()
+    install_crew_executor()
+    await db_manager.init_db()
+    try:
+        await asyncio.gather(
+            queue_maintenance(),
+            *(queue_consumer(worker_id) for worker_id in range(concurrency))
+        )
+    finally:
+        await queue_manager.close()
+        await db_manager.close()
+        stop_log_listener()
+
+if __name__ == "__main__":
+    if not queue_manager.use_redis:
+        raise SystemExit("worker.py needs REDIS_URL; the in-memory queue only lives inside the API process")
+    
+    asyncio.run(run_worker(WORKER_CONCURRENCY))